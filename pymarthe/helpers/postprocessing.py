@@ -12,9 +12,6 @@ import pyemu
 from copy import deepcopy
 
 
-# -- Import plot modules
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
 from pymarthe.utils import marthe_utils, shp_utils, pest_utils, pp_utils
 
 
@@ -84,6 +81,9 @@ class PestPostProcessing():
         ppp.phi_progress(phimlim=True, filename='phi_progress.png')
 
         """
+        # ---- Import matplotlib only when plotting is required
+        import matplotlib.pyplot as plt
+
         # ---- Get phi values according to pest output file(s)
         if pest_exe == 'hp':
             # -- Get ofr file
@@ -174,6 +174,9 @@ class PestPostProcessing():
         ppp.phi_components(filename='phi_components.png')
 
         """
+        # ---- Import matplotlib only when plotting is required
+        import matplotlib.pyplot as plt
+
         # ---- Manages observation group names
         obs_groups = self.pst.obs_groups if obs_groups is None else marthe_utils.make_iterable(obs_groups)
         # ---- Fetch phi components data from pst
@@ -319,6 +322,9 @@ class PestPostProcessing():
                        onefile=False, path='pest/post_proc')
 
         """
+        # ---- Import matplotlib only when plotting is required
+        import matplotlib.pyplot as plt
+
         # ---- Manage required observation groups
         obgnmes = self.pst.nnz_obs_groups if obs_groups is None else marthe_utils.make_iterable(obs_groups)
 
@@ -561,6 +567,9 @@ class PestPostProcessing():
         PestPostProcessing.to_onefile(axs, 'all_plots.pdf')
 
         """ 
+        # ---- Import matplotlib only when plotting is required
+        from matplotlib.backends.backend_pdf import PdfPages
+
         # ---- Open global pdf
         with PdfPages(filename) as pdf:
             # -- Iterate over axes
@@ -5,14 +5,11 @@ Designed for handling distributed Marthe properties
 (structured and unstructured grid)
 """
 
-import os, sys
+import os
 import numpy as np
 import numpy.lib.recfunctions
 import pandas as pd
-from copy import copy, deepcopy
 import shutil
-import matplotlib.pyplot as plt
-from matplotlib.collections import PathCollection
 from .utils import marthe_utils, shp_utils, pest_utils
 from .utils.grid_utils import MartheGrid
 
@@ -24,6 +21,12 @@ class MartheField():
     """
     Wrapper Marthe --> python
     """
+    # ---- Field data record format (compact integer columns)
+    dtype = np.dtype([('layer', '<i2'), ('inest', '<i2'),
+                      ('i', '<i4'), ('j', '<i4'),
+                      ('x', '<f8'), ('y', '<f8'),
+                      ('value', '<f8')])
+
     def __init__(self, field, data, mm, use_imask=True):
         """
         Marthe gridded property instance.
@@ -65,6 +68,7 @@ class MartheField():
         self.mm = mm
         self.dmv = dmv
         self.use_imask = use_imask
+        self._grid_meta = {}
         self.set_data(data)
         self.maxlayer = len(self.to_grids(inest=0))
         self.maxnest = len(self.to_grids(layer=0)) - 1  # inest = 0 is the main grid
@@ -73,6 +77,82 @@ class MartheField():
         self._proptype = 'grid'
 
 
+    @classmethod
+    def _from_shared(cls, mf, field, values=None):
+        """
+        Build a MartheField instance sharing the model, geometry and
+        cached informations of an existing MartheField (no deepcopy).
+        Only the field data (recarray) and cache containers are copied.
+
+        Parameters:
+        ----------
+        mf (MartheField) : source MartheField instance (ex: `.imask`).
+        field (str) : name of the new field.
+        values (1D-array, optional) : values of the new field.
+                                      If None, source values are kept.
+                                      Default is None.
+
+        Returns:
+        --------
+        new (MartheField) : new MartheField instance.
+
+        Examples:
+        --------
+        mf = MartheField._from_shared(mm.imask, 'CHARGE_001', values)
+        """
+        # ---- Fetch (layer, inest) blocks once on source field
+        mf._get_group_bounds()
+        # ---- Share attributes by reference (model, geometry arrays, ...)
+        new = cls.__new__(cls)
+        new.__dict__.update(mf.__dict__)
+        # ---- Set own mutable containers (caches filled later must not leak)
+        new.dmv = list(mf.dmv)
+        new._grid_meta = dict(mf._grid_meta)
+        new._group_bounds = dict(mf._group_bounds) if mf._group_bounds else mf._group_bounds
+        new._grid_lookup = None if mf._grid_lookup is None else list(mf._grid_lookup)
+        # ---- Set own field name and data
+        new.field = field
+        new.data = mf.data.copy()
+        if values is not None:
+            new.data['value'] = values
+        return new
+
+
+
+    def _detach(self, layer, inest=None):
+        """
+        Light copy of a field subset, detached from its parent model.
+        Only the required (layer, inest) blocks and their geometry are kept
+        (e.g. to be sent to an other process for plotting).
+
+        Parameters:
+        ----------
+        layer (int) : layer id to keep.
+        inest (int/it, optional) : nested grid id(s) to keep.
+                                   If None, all nested grids are considered.
+                                   Default is None.
+
+        Returns:
+        --------
+        new (MartheField) : detached MartheField instance (no parent model).
+
+        Examples:
+        --------
+        ax = mf._detach(layer=2).plot(layer=2)
+        """
+        # ---- Subset field data (contiguous blocks of the layer)
+        rec = self.get_data(layer=layer, inest=inest)
+        keys = set(zip(rec['layer'].tolist(), rec['inest'].tolist()))
+        # ---- Fetch required grid geometry before detaching from model
+        meta = {k: self._get_grid_meta(*k) for k in keys}
+        # ---- Build new instance without model and caches
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        new.mm, new.data = None, rec
+        new._group_bounds, new._grid_lookup, new._grid_meta = None, None, meta
+        return new
+
+
     def get_xyvertices(self, stack=False):
         """
         Function to fetch x and y vertices of the modelgrid.
@@ -97,20 +177,237 @@ class MartheField():
         vx, vy = mf.get_xyvertices()
         
         """
-        # ---- Initialize xy vertices list
-        xvertices, yvertices = [], []
-        # ---- Iterate over MartheGrid on first layer only
-        for mg in self.to_grids(layer=0):
-            # -- Get vertices for whole structured grid (1D) 
-            xvs, yvs = map(np.ravel, np.meshgrid(mg.xvertices, mg.yvertices))
-            # -- Store it in main lists
-            xvertices.extend(xvs)
-            yvertices.extend(yvs)
+        # ---- Get MartheGrid on first layer only
+        grids = self.to_grids(layer=0)
+        # ---- Preallocate xy vertices arrays
+        shapes = [(len(mg.yvertices), len(mg.xvertices)) for mg in grids]
+        n = sum(ny * nx for ny, nx in shapes)
+        xvertices, yvertices = np.empty(n), np.empty(n)
+        # ---- Fill vertices of each structured grid (1D) by broadcasting
+        start = 0
+        for mg, (ny, nx) in zip(grids, shapes):
+            end = start + ny * nx
+            xvertices[start:end].reshape(ny, nx)[:] = mg.xvertices
+            yvertices[start:end].reshape(ny, nx)[:] = mg.yvertices[:, np.newaxis]
+            start = end
         # ---- Return
         if stack:
             return np.column_stack([xvertices, yvertices])
         else:
-            return np.array(xvertices), np.array(yvertices)
+            return xvertices, yvertices
+
+
+
+    def _get_group_bounds(self):
+        """
+        Fetch and cache the bounds of each (layer, inest) block of field data.
+        Field data is built by stacking structured grids, so each block
+        is stored contiguously and can be accessed by simple slicing.
+
+        Parameters:
+        ----------
+        self (MartheField) : MartheField instance.
+
+        Returns:
+        --------
+        bounds (dict/None) : first/last+1 index of each (layer, inest) block.
+                             Format: { (layer, inest): (start, end), ...}
+                             Note : None if blocks are not contiguous.
+
+        Examples:
+        --------
+        start, end = mf._get_group_bounds()[(layer, inest)]
+        """
+        if self._group_bounds is None:
+            # -- Find changes of (layer, inest) in field data
+            layers, inests = self.data['layer'], self.data['inest']
+            change = np.flatnonzero((np.diff(layers) != 0) | (np.diff(inests) != 0)) + 1
+            starts, ends = np.r_[0, change], np.r_[change, len(self.data)]
+            keys = list(zip(layers[starts].tolist(), inests[starts].tolist()))
+            # -- Store bounds only if each block is contiguous
+            if len(set(keys)) == len(keys):
+                self._group_bounds = dict(zip(keys, zip(starts.tolist(), ends.tolist())))
+            else:
+                self._group_bounds = False
+        return self._group_bounds or None
+
+
+
+    def _set_grid_meta(self, grids):
+        """
+        Store geometry informations (xcc, ycc, dx, dy) of
+        MartheGrid instances by (layer, inest).
+
+        Parameters:
+        ----------
+        grids (list) : MartheGrid instances.
+
+        Returns:
+        --------
+        Set grid metadata inplace.
+
+        Examples:
+        --------
+        mf._set_grid_meta(marthe_utils.read_grid_file('mymodel.permh'))
+        """
+        self._grid_meta = {(mg.layer, mg.inest): (mg.xcc, mg.ycc, mg.dx, mg.dy)
+                                for mg in grids}
+
+
+
+    def _get_grid_meta(self, layer, inest):
+        """
+        Fetch geometry informations (xcc, ycc, dx, dy) of a (layer, inest) grid.
+        Stored metadata is used if available (field or model imask
+        if the field is related to the model, `use_imask`=True),
+        otherwise it is recovered from field data xy-coordinates.
+        Note : recovered dx/dy are the gradient of cell centers, which
+               only matches uneven cell sizes approximately.
+
+        Parameters:
+        ----------
+        layer (int) : number of layer required.
+        inest (int) : number of nested grid required.
+
+        Returns:
+        --------
+        xcc, ycc (1D-array) : x/y cell centers.
+        dx, dy (1D-array) : x/y-resolution of the grid.
+
+        Examples:
+        --------
+        xcc, ycc, dx, dy = mf._get_grid_meta(layer=2, inest=0)
+        """
+        key = (int(layer), int(inest))
+        # ---- Use model geometry if not available on field (related field only)
+        imask = getattr(self.mm, 'imask', None) if self.use_imask else None
+        if (key not in self._grid_meta) and (imask is not None) and (imask is not self):
+            if key in imask._grid_meta:
+                self._grid_meta[key] = imask._grid_meta[key]
+        # ---- Recover geometry from xy-coordinates
+        if key not in self._grid_meta:
+            x, y, j = [self._get_column(c, layer, inest) for c in ['x', 'y', 'j']]
+            # -- Grid cells are stored row by row (x increasing, y decreasing)
+            ncol = int(j.max()) + 1
+            err_msg = f"ERROR: grid (layer={layer}, inest={inest}) is not a full structured grid."
+            assert len(x) % ncol == 0, err_msg
+            xcc, ycc = x[:ncol], y[::ncol]
+            dx, dy = map(abs,map(np.gradient, [xcc,ycc])) # Using the absolute gradient
+            self._grid_meta[key] = (xcc, ycc, dx, dy)
+        return self._grid_meta[key]
+
+
+
+    def _get_column(self, name, layer, inest):
+        """
+        Fetch a single column of a (layer, inest) block of field data
+        without copying the other record fields.
+
+        Parameters:
+        ----------
+        name (str) : column name ('layer', 'inest', 'i', 'j', 'x', 'y', 'value').
+        layer (int) : number of layer required.
+        inest (int) : number of nested grid required.
+
+        Returns:
+        --------
+        col (1D-array) : column data of the block.
+                         Note : a view on field data is returned when
+                                (layer, inest) blocks are contiguous.
+
+        Examples:
+        --------
+        values = mf._get_column('value', layer=2, inest=0)
+        """
+        bounds = self._get_group_bounds()
+        if bounds is None:
+            mask = (self.data['layer'] == layer) & (self.data['inest'] == inest)
+            return self.data[name][mask]
+        else:
+            return self.data[name][slice(*bounds[(layer, inest)])]
+
+
+
+    def _build_grid_lookup(self):
+        """
+        Build and cache the cell bounds of each structured grid
+        to locate points by simple arithmetic (no spatial index required).
+
+        Parameters:
+        ----------
+        self (MartheField) : MartheField instance.
+
+        Returns:
+        --------
+        lookup (list) : grid cell bounds.
+                        Format: [ (layer, inest, start, nrow, ncol,
+                                   xlo, xhi, ylo, yhi), ...]
+                        Note : `start` is the field index of the first
+                               cell of the grid, x/y-bounds are sorted
+                               in ascending order.
+
+        Examples:
+        --------
+        lookup = mf._build_grid_lookup()
+        """
+        if self._grid_lookup is None:
+            # -- Get first index of each (layer, inest) block
+            starts = {k: s for k, (s, e) in self._get_group_bounds().items()}
+            # -- Store cell bounds as they are inserted in spatial index
+            self._grid_lookup = []
+            for mg in self.to_grids():
+                self._grid_lookup.append(
+                    ( mg.layer, mg.inest, starts[(mg.layer, mg.inest)], mg.nrow, mg.ncol,
+                      mg.xcc - mg.dx/2, mg.xcc + mg.dx/2,
+                      (mg.ycc - mg.dy/2)[::-1], (mg.ycc + mg.dy/2)[::-1] )
+                                         )
+        return self._grid_lookup
+
+
+
+    def _locate(self, x, y, layer):
+        """
+        Locate points on structured grids.
+        Points lying on cell edges/corners will intersect all
+        adjacent cells (same behaviour as the spatial index).
+
+        Parameters:
+        ----------
+        x, y (1D-array) : xy-coordinates of the points.
+        layer (1D-array) : layer id of each point.
+
+        Returns:
+        --------
+        pts (1D-array) : point index of each hit.
+        idx (1D-array) : cell ids of each hit.
+
+        Examples:
+        --------
+        pts, idx = mf._locate(x, y, layer)
+        """
+        pts, idx = [], []
+        for l, n, start, nrow, ncol, xlo, xhi, ylo, yhi in self._build_grid_lookup():
+            # -- Subset points on current layer
+            p = np.flatnonzero(layer == l)
+            if len(p) == 0:
+                continue
+            # -- Get first/last intersected columns and rows
+            j0 = np.searchsorted(xhi, x[p], side='left')
+            j1 = np.searchsorted(xlo, x[p], side='right') - 1
+            k0 = np.searchsorted(yhi, y[p], side='left')
+            k1 = np.searchsorted(ylo, y[p], side='right') - 1
+            # -- Store all intersected cells
+            nj, nk = np.clip(j1 - j0 + 1, 0, None), np.clip(k1 - k0 + 1, 0, None)
+            for dk in range(nk.max(initial=0)):
+                for dj in range(nj.max(initial=0)):
+                    m = (dk < nk) & (dj < nj)
+                    i, j = nrow - 1 - (k0[m] + dk), j0[m] + dj
+                    pts.append(p[m])
+                    idx.append(start + i * ncol + j)
+        # -- Sort hits by point
+        pts, idx = np.concatenate([[]] + pts).astype(int), np.concatenate([[]] + idx).astype(int)
+        order = np.argsort(pts, kind='stable')
+        return pts[order], idx[order]
 
 
 
@@ -152,31 +449,60 @@ class MartheField():
                   f"Given : x = {len(_x)}, y = {len(_y)}, layer ={len(_layer)}."
         assert len(_x) == len(_y) == len(_layer), err_msg
 
-        # -- Build spatial index if required
-        if self.mm.spatial_index is None:
-            self.mm.build_spatial_index()
-
         # -- Manage masked values
         mv = [] if masked_values is None else marthe_utils.make_iterable(masked_values)
 
-        # ---- Perform intersection on spatial index returning cell ids
-        idx = []
-        for ix,iy,ilay in zip(_x, _y, _layer):
-            for hit in self.mm.spatial_index.intersection((ix,iy), objects='raw'):
-                if (hit[1] == ilay) & (hit[-1] not in mv):
-                    idx.append(hit[0])
+        # -- Build spatial index if required (grids can not be located directly)
+        if (self.mm.spatial_index is None) and (self._get_group_bounds() is None):
+            self.mm.build_spatial_index()
 
-        # ---- Convert nodes/indexes to boolean mask
-        mask = np.zeros(len(self.data), dtype=bool)
-        mask[idx] = True
+        # ---- Locate points on grids if no spatial index is available
+        if self.mm.spatial_index is None:
+            _, hits = self._locate(np.asarray(_x, dtype=float),
+                                   np.asarray(_y, dtype=float),
+                                   np.asarray(_layer))
+            # -- Filter hits by cell activity
+            idx = list(hits[marthe_utils.fast_mask_out(self.mm.imask.data['value'][hits], mv)])
+
+        # ---- Perform intersection on spatial index returning cell ids
+        else:
+            # -- Query points along a Z-order curve (close successive queries)
+            xy = np.column_stack([_x, _y]).astype(float)
+            order = shp_utils.zorder(xy[:,0], xy[:,1])
+            if hasattr(self.mm.spatial_index, 'intersection_v'):
+                # -- Bulk intersection of all points at once (rtree >= 1.4)
+                zhits, zcounts = self.mm.spatial_index.intersection_v(xy[order], xy[order])
+            else:
+                # -- Collect cell ids of all points (without stored objects)
+                zhits = [list(self.mm.spatial_index.intersection(tuple(ixy)))
+                            for ixy in xy[order]]
+                zcounts = list(map(len, zhits))
+                zhits = [hit for phits in zhits for hit in phits]
+            zhits, zcounts = np.asarray(zhits, dtype=np.intp), np.asarray(zcounts, dtype=np.intp)
+            # -- Restore hits in input points order
+            counts, zstarts = np.empty_like(zcounts), np.empty_like(zcounts)
+            counts[order], zstarts[order] = zcounts, np.cumsum(zcounts) - zcounts
+            starts = np.cumsum(counts) - counts
+            hits = zhits[np.repeat(zstarts - starts, counts) + np.arange(counts.sum())]
+            # -- Note : cells are indexed with their exact rectangular bounds,
+            #           hits do not require any further point-in-cell refinement
+            # -- Filter hits by layer and cell activity (as stored in spatial index objects)
+            hit_layer = self.mm.imask.data['layer'][hits]
+            hit_value = self.mm.imask.data['value'][hits]
+            mask = (hit_layer == np.repeat(_layer, counts)) & marthe_utils.fast_mask_out(hit_value, mv)
+            idx = list(hits[mask])
 
         # ---- Return as required
         if as_idx:
             return idx
         elif as_mask:
+            # -- Convert nodes/indexes to boolean mask
+            mask = np.zeros(len(self.data), dtype=bool)
+            mask[idx] = True
             return mask
         else:
-            return self.data[mask]
+            # -- Select sorted unique nodes/indexes directly (same as masking)
+            return self.data[np.unique(np.asarray(idx, dtype=np.intp))]
 
 
 
@@ -214,41 +540,60 @@ class MartheField():
         arr1 = mf.get_data(inest=3, as_array=True)
 
         """
+        # ---- Fetch contiguous (layer, inest) blocks
+        bounds = self._get_group_bounds()
         # ---- Manage layer input
         if layer is None:
-            layers = np.unique(self.data['layer'])
+            layers = np.unique(self.data['layer']) if bounds is None \
+                     else sorted(set(l for l, n in bounds))
         else: 
             layers = marthe_utils.make_iterable(layer)
         # ---- Manage inest input
         if inest is None:
-            inests = np.unique(self.data['inest'])
+            inests = np.unique(self.data['inest']) if bounds is None \
+                     else sorted(set(n for l, n in bounds))
         else: 
             inests = marthe_utils.make_iterable(inest)
         # ---- Manage masked_values
         mv = marthe_utils.make_iterable(masked_values)
-        # ---- Apply required mask
-        mask   = np.logical_and.reduce([np.isin(self.data['layer'], layers),
-                                        np.isin(self.data['inest'], inests),
-                                        ~np.isin(self.data['value'], mv)])
-        # ---- Return as mask if required
-        if as_mask:
-            return mask
         # ---- Return as array
         if as_array:
             arrays = []
             # -- Subset by layer(s)
             for l in layers:
-                ldata = self.data[self.data['layer'] == l]
                 # ---- Subset by nested
                 for n in inests:
-                    ndata = ldata[ldata['inest'] == n]
                     # -- Fetch nrow, ncol of the current grid
-                    nrow = np.max(ndata['i']) + 1
-                    ncol = np.max(ndata['j']) + 1
+                    nrow = np.max(self._get_column('i', l, n)) + 1
+                    ncol = np.max(self._get_column('j', l, n)) + 1
                     # -- Rebuild array by reshaping with nrow, ncol
-                    arrays.append(ndata['value'].reshape(nrow,ncol))
+                    arrays.append(self._get_column('value', l, n).reshape(nrow,ncol))
             # -- Returning array
             return np.array(arrays)
+        # ---- Apply required mask
+        if bounds is None:
+            # -- Narrow mask progressively (only test rows still selected)
+            mask = np.isin(self.data['layer'], layers)
+            mask[mask] = np.isin(self.data['inest'][mask], inests)
+            mask[mask] = marthe_utils.fast_mask_out(self.data['value'][mask], mv)
+        else:
+            # -- Only scan values of the required blocks
+            if all(isinstance(v, (int, np.integer)) for v in [layer, inest]):
+                # -- Direct lookup of a single (layer, inest) block
+                key = (int(layer), int(inest))
+                groups = [bounds[key]] if key in bounds else []
+            else:
+                groups = [(s, e) for (l, n), (s, e) in bounds.items()
+                                 if (l in layers) and (n in inests)]
+            # -- Return a single unmasked block by slicing
+            if (len(groups) == 1) and (len(mv) == 0) and not as_mask:
+                return self.data[slice(*groups[0])].copy()
+            mask = np.zeros(len(self.data), dtype=bool)
+            for s, e in groups:
+                mask[s:e] = marthe_utils.fast_mask_out(self.data['value'][s:e], mv)
+        # ---- Return as mask if required
+        if as_mask:
+            return mask
         # -- Returning as recarray
         else:
             return self.data[mask]
@@ -287,6 +632,12 @@ class MartheField():
         mf.set_data(2.3e-3, layer=2, inest=3) # one nest
 
         """
+        # ---- Reset cached grid informations (geometry may change)
+        grid_meta = getattr(self, '_grid_meta', {})
+        self._group_bounds = None
+        self._grid_lookup = None
+        self._grid_meta = {}
+
         # ---- Set all useful conditions
         _none = all(x is None for x in [layer, inest])
         _str = isinstance(data, str)
@@ -300,22 +651,25 @@ class MartheField():
             grids = marthe_utils.read_grid_file(data)
             rec =  self.grids2rec(grids)
             self.data = self.get_masked(rec)
+            self._set_grid_meta(grids)
 
         # ---- Manage list of MartheGrids as input
         if np.logical_and.reduce([_list, _none]):
             self.data =  self.get_masked(self.grids2rec(data))
+            self._set_grid_meta(data)
 
         # ---- Manage numeric input
         if _num:
             # -- If .data already exist
             try:
-                # -- Set value on existing data
+                # -- Set value on existing data (same geometry)
                 mask = self.get_data(layer=layer, inest=inest,
                             masked_values=self.dmv, as_mask=True)
                 self.data['value'][mask] = data
+                self._grid_meta = grid_meta
             except:
                 # -- Copy .imask recarray and change value by provided float/int
-                rec = deepcopy(self.mm.imask.data)
+                rec = self.mm.imask.data.copy()
                 mask = self.mm.imask.get_data(layer=layer, inest=inest,
                             masked_values=self.dmv, as_mask=True)
                 rec['value'][mask] = data
@@ -355,7 +709,7 @@ class MartheField():
         """
         # -- Model dependent grid (only contains value)
         if np.logical_and(self.use_imask, self.field.casefold() != 'imask'):
-            mrec = deepcopy(self.mm.imask.data)
+            mrec = self.mm.imask.data.copy()
             mask = self.mm.imask.get_data(masked_values=self.dmv, as_mask=True)
             mrec['value'][mask] = rec['value'][mask]
 
@@ -399,14 +753,20 @@ class MartheField():
 
         # ---- Manage zone of piecewise constancy (zpc) data
         if ptype == 'zpc':
-            # -- Iterate over recarray (layer, zone, value)
-            for l,z,v in rec:
-                # -- Mask and set
-                mask = np.logical_and.reduce(
-                            [ self.get_data(layer=l, masked_values=dmv, as_mask=True),
-                              izone.data['value'] == z]
-                              )
-                self.data['value'][mask] = v
+            # -- Fetch non-masked cell ids of all parameter layers at once
+            idx = np.flatnonzero(self.get_data(layer=np.unique(rec['layer']),
+                                               masked_values=dmv, as_mask=True))
+            # -- Get unique parameter (layer, zone) keys (last value is kept on duplicates)
+            par_keys = pd.MultiIndex.from_arrays([rec['layer'], rec['zone'].astype(float)])
+            keep = ~par_keys.duplicated(keep='last')
+            par_keys, values = par_keys[keep], rec['bvalue'][keep]
+            # -- Match (layer, zone) of each cell with parameter keys
+            cell_keys = pd.MultiIndex.from_arrays([self.data['layer'][idx],
+                                                   izone.data['value'][idx].astype(float)])
+            ipar = par_keys.get_indexer(cell_keys)
+            # -- Set matched cells
+            match = ipar >= 0
+            self.data['value'][idx[match]] = values[ipar[match]]
 
         # ---- Manage pilot point (pp) data
         if ptype == 'pp':
@@ -473,11 +833,15 @@ class MartheField():
         rec = mf._grid2rec('mymodel.emmca')
 
         """
-        # ---- Get recarray data from consecutive MartheGrid instance (mg) extract from field property file
-        rec = np.lib.recfunctions.stack_arrays(
-                [mg.to_records() for mg in grids],
-                        autoconvert=True, usemask=False, asrecarray=True)
-        # ---- Stack all recarrays as once
+        # ---- Get consecutive MartheGrid instance (mg) extract from field property file
+        grids = list(grids)
+        sizes = [mg.nrow * mg.ncol for mg in grids]
+        # ---- Copy each grid records into its own block of a preallocated recarray
+        rec, start = np.empty(sum(sizes), dtype=MartheField.dtype).view(np.recarray), 0
+        for mg, size in zip(grids, sizes):
+            rec[start:start + size] = mg.to_records()
+            start += size
+        # ---- Return stacked recarray
         return rec
 
 
@@ -513,16 +877,15 @@ class MartheField():
         assert len(arr3d.shape) == 3, err_msg
 
         # ---- Fetch basic model structure
-        rec = deepcopy(self.mm.imask.data)
-        df = pd.DataFrame.from_records(rec)
-        
+        rec = self.mm.imask.data.copy()
+        main = rec['inest'] == 0
+
         # ---- Modify rec inplace
         for layer, arr2d in enumerate(arr3d):
-            mask = (df.layer == layer) & (df.inest == 0)
-            df.loc[mask, 'value'] = arr2d.ravel()
+            rec['value'][main & (rec['layer'] == layer)] = arr2d.ravel()
 
         # ---- Return recarray
-        return df.to_records(index=False)
+        return rec
 
 
 
@@ -549,11 +912,9 @@ class MartheField():
         # ---- Get 2D-array of a unique layer/inest
         array = self.get_data(layer, inest, as_array=True)[0]
         nrow, ncol = array.shape
-        # ---- Get xcc, ycc
-        rec = self.get_data(layer, inest)
-        xcc, ycc = np.unique(rec['x']), np.flip(np.unique(rec['y']))
-        # ---- Fetch xl, yl, dx, dy
-        dx, dy = map(abs,map(np.gradient, [xcc,ycc])) # Using the absolute gradient
+        # ---- Fetch xcc, ycc, dx, dy
+        xcc, ycc, dx, dy = self._get_grid_meta(layer, inest)
+        # ---- Fetch xl, yl
         xl, yl = xcc[0] - dx[0]/2, ycc[-1] - dy[-1]/2
         # ---- Stack all MartheGrid arguments in ordered list
         istep = -9999
@@ -564,6 +925,52 @@ class MartheField():
 
 
 
+    def iter_grids(self, layer=None, inest=None):
+        """
+        Iterate over internal data (recarray) as MartheGrid
+        instances for given layers and inests.
+        Grids are built one at a time (lighter than .to_grids()).
+
+        Parameters:
+        ----------
+        layer (int, optional) : number(s) of layer required.
+                                If None, all layers are considered.
+                                Default is None.
+        inest (int, optional) : number(s) of nested grid required.
+                                If None, all nested are considered.
+                                Default is None.
+
+        Returns:
+        --------
+        mgrids (generator) : Required MartheGrid instances.
+
+        Examples:
+        --------
+        for mg in mf.iter_grids(layer=2):
+            print(mg.nrow, mg.ncol)
+        """
+        # ---- Fetch contiguous (layer, inest) blocks
+        bounds = self._get_group_bounds()
+
+        if bounds is None:
+            # ---- Subset data with required layer, inest
+            rec = self.get_data(layer, inest)
+            keys = [(l, n) for n in np.unique(rec['inest'])
+                           for l in np.unique(rec['layer'])]
+        else:
+            # ---- Select required blocks directly (ordered by inest, layer)
+            layers = None if layer is None else marthe_utils.make_iterable(layer)
+            inests = None if inest is None else marthe_utils.make_iterable(inest)
+            keys = [(l, n) for l, n in sorted(bounds, key=lambda k: (k[1], k[0]))
+                           if (layers is None or l in layers)
+                           and (inests is None or n in inests)]
+
+        # ---- Iterate over layer and inest
+        for l, n in keys:
+            yield self._rec2grid(l, n)
+
+
+
     def to_grids(self, layer=None, inest=None):
         """
         Converting internal data (recarray) to a list of
@@ -586,17 +993,8 @@ class MartheField():
         --------
         mg = mf.to_grids(layer)
         """
-        # ---- Subset data with required layer, inest
-        rec = self.get_data(layer, inest)
-
-        # ---- Iterate over layer and inest
-        mgrids = []
-        for inest in np.unique(rec['inest']):
-            for layer in np.unique(rec['layer']):
-                mgrids.append(self._rec2grid(layer, inest))
-
         # ---- Return list of grids
-        return mgrids
+        return list(self.iter_grids(layer, inest))
 
 
 
@@ -635,9 +1033,9 @@ class MartheField():
         # ---- Extract refine levels dictionary
         rl = self.mm.extract_refine_levels()
 
-        # ---- Write field data from list of MartheGrid instance
+        # ---- Write field data from MartheGrid instances (one at a time)
         with open(f, 'w', encoding = marthe_utils.encoding) as f:
-            for mg in self.to_grids():
+            for mg in self.iter_grids():
                 f.write(
                             mg.to_string(
                                 maxlayer = self.maxlayer,
@@ -702,25 +1100,24 @@ class MartheField():
 
         # ---- fetch data
         data = self.get_data(layer=layer, inest=inest)
-        df = pd.DataFrame.from_records(data).assign(parts=parts)
 
         # ---- Apply mask values
         mv = [] if masked_values is None else masked_values
-        df = df[~df['value'].isin(mv)]
+        keep = np.flatnonzero(marthe_utils.fast_mask_out(data['value'], mv))
+        data = data[keep]
         # ---- Fetch subset parts (goemetries)
-        parts = df.pop('parts')
+        parts = [parts[k] for k in keep]
 
         # ---- Log transform if required
-        values = df.pop('value')
         col = 'val'
         if log:
             col = f'log({col})'
-            values = np.log10(values)
+            data['value'] = np.log10(data['value'])
         # ---- Set value 
-        df[col] = values
+        data = np.lib.recfunctions.rename_fields(data, {'value': col})
 
         # ---- Convert reccaray to shafile
-        shp_utils.recarray2shp(df.to_records(index=False), np.array(parts),
+        shp_utils.recarray2shp(data, parts,
                                shpname=filename, epsg=epsg, prj=prj)
 
         # ---- Sum up export
@@ -730,7 +1127,8 @@ class MartheField():
 
     def plot(self,  ax=None, layer=0, inest=None, vmin=None,
                     vmax=None, log = False, extent = None,
-                    masked_values = dmv, basemap=False, rc_font=False, **kwargs):
+                    masked_values = dmv, basemap=False, rc_font=False,
+                    precision='double', **kwargs):
         """
         Plot data by layer
 
@@ -779,6 +1177,10 @@ class MartheField():
         
         rc_font (bool, optionnal): change rc_font to 'serif', default is False.
 
+        precision (str, optional) : floating point precision of plotted values.
+                                    Can be 'single' (float32) or 'double' (float64).
+                                    Default is 'double'.
+
         **kwargs (optional) : matplotlib.PathCollection arguments.
                               (ex: cmap, lw, ls, edgecolor, ...)
 
@@ -794,6 +1196,10 @@ class MartheField():
         ax.set_title('Field (layer = 6)', fontsize=14)
 
         """
+        # ---- Import matplotlib only when plotting is required
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import PathCollection
+
         # ---- Perform a bunch of assertions on `layer` and `inest` arguments
         err_msg = f"`layer` must be an integer between 0 and {self.maxlayer -1}."
         assert isinstance(layer, int), err_msg
@@ -810,13 +1216,12 @@ class MartheField():
 
         # ---- Subset required data 
         data = self.get_data(layer=layer, inest=inest)
-        df = pd.DataFrame.from_records(data).assign(patches=patches)
         
         # ---- Apply mask values
-        if masked_values is None:
-            rec = df.to_records(index=False)
-        else:
-            rec = df[~df['value'].isin(masked_values)].to_records(index=False)
+        if masked_values is not None:
+            keep = np.flatnonzero(marthe_utils.fast_mask_out(data['value'], masked_values))
+            data = data[keep]
+            patches = [patches[k] for k in keep]
         
         # ---- Prepare basic axe if not provided
         if ax is None:
@@ -825,10 +1230,11 @@ class MartheField():
             fig, ax = plt.subplots(figsize=(10,8))
 
         # ---- Build a collection from rectangles patches and values
-        collection = PathCollection(rec['patches'])
+        collection = PathCollection(patches)
 
-        # ----- Set values of each polygon
-        arr = np.log10(rec['value']) if log else rec['value']
+        # ----- Set values of each polygon (in required precision)
+        arr = data['value'].astype(marthe_utils.get_float_dtype(precision), copy=False)
+        arr = np.log10(arr) if log else arr
         collection.set_array(arr)
 
         # ---- Set default values limites
@@ -932,25 +1338,41 @@ class MartheField():
         vx, vy = self.get_xyvertices()
 
         # ---- Iterate over all polygons
-        dfs = []
-        for p, name in zip(polygons, _names):
-            # -- Mask vertices in polygon
-            mask = shp_utils.point_in_polygon(vx, vy, p)
-            # ---- Map layer to vertices coord
-            rec = np.lib.recfunctions.stack_arrays(
-                    [self.sample(vx[mask], vy[mask], layer=ilay, masked_values=self.dmv)
-                            for ilay in _layer],
-                                autoconvert=True, usemask=False)
-            # -- Get data as DataFrame
-            df = pd.DataFrame.from_records(rec).drop_duplicates()
-            df['zone'] = name
-            # -- Perform required stats on tranform value
-            if trans is not None:
-                df['value'] = df['value'].transform(trans)
-            stats = df.groupby(['zone', 'layer'])['value'].agg(_stats)
-            dfs.append(stats)
+        zones, nodes = [], []
+        for z, p in enumerate(polygons):
+            # -- Prefilter vertices in polygon bounding box
+            pxy = np.asarray(p, dtype=float)
+            (xmin, ymin), (xmax, ymax) = pxy.min(axis=0), pxy.max(axis=0)
+            cand = np.flatnonzero((vx >= xmin) & (vx <= xmax) & (vy >= ymin) & (vy <= ymax))
+            # -- Prune candidates out of polygon circumcircle (centroid, max radius)
+            cx, cy = pxy.mean(axis=0)
+            r2 = np.max((pxy[:,0] - cx)**2 + (pxy[:,1] - cy)**2)
+            cand = cand[(vx[cand] - cx)**2 + (vy[cand] - cy)**2 <= r2]
+            # -- Mask vertices in polygon (ray casting on candidates only)
+            inside = cand[shp_utils.point_in_polygon(vx[cand], vy[cand], p)]
+            # -- Map all layers to vertices coord at once (unique cell nodes)
+            n = len(inside)
+            idx = self.sample(np.tile(vx[inside], len(_layer)),
+                              np.tile(vy[inside], len(_layer)),
+                              np.repeat(_layer, n),
+                              masked_values=self.dmv, as_idx=True)
+            idx = np.unique(np.asarray(idx, dtype=np.intp))
+            nodes.append(idx)
+            zones.append(np.full(len(idx), z))
+        # ---- Collect sampled data as plain columns
+        nodes = np.concatenate(nodes)
+        df = pd.DataFrame({'zone': np.concatenate(zones),
+                           'layer': self.data['layer'][nodes],
+                           'value': self.data['value'][nodes]})
+        # -- Perform required stats on tranform value
+        if trans is not None:
+            df['value'] = pest_utils.transform(df['value'], trans).values
         # ---- Build zonal stats DataFrame
-        zstats_df = pd.concat(dfs)
+        zstats_df = df.groupby(['zone', 'layer'])['value'].agg(_stats)
+        zstats_df.index = pd.MultiIndex.from_arrays(
+                [np.asarray(_names, dtype=object)[zstats_df.index.get_level_values('zone')],
+                 zstats_df.index.get_level_values('layer')],
+                names = ['zone', 'layer'])
         # ---- Return
         return zstats_df
 
@@ -958,7 +1380,7 @@ class MartheField():
 
 
 
-    def to_vtk(self, filename=None, trans='none', masked_values = dmv, **kwargs):
+    def to_vtk(self, filename=None, trans='none', masked_values = dmv, precision='double', **kwargs):
         """
         Build vtk unstructured grid from model geometry and 
         add current field to cell dataset.
@@ -978,6 +1400,9 @@ class MartheField():
                                 Default is 'none'.
         masked_values (float/it, optional) : values to mask of the current field data.
                                              Default are [9999, 0, -9999].
+        precision (str, optional) : floating point precision of cell values.
+                                    Can be 'single' (float32) or 'double' (float64).
+                                    Default is 'double'.
         vertical_exageration (float, kwargs) : floating point value to scale vertical
                                                exageration of the vtk points.
                                                Default is 0.05.
@@ -1018,14 +1443,15 @@ class MartheField():
         # -- Manage output file name
         f = self.field if filename is None else filename
 
-        # -- Manage masked values
-        mv = marthe_utils.make_iterable(masked_values)
+        # -- Manage values precision and masked values (same precision)
+        dtype = marthe_utils.get_float_dtype(precision)
+        mv = np.asarray(marthe_utils.make_iterable(masked_values), dtype=dtype).tolist()
 
         # -- Get Vtk instance
         vtk = self.mm.get_vtk(**kwargs)
 
         # -- Add field data to vtk
-        vtk.add_array(self.data['value'],
+        vtk.add_array(self.data['value'].astype(dtype, copy=False),
                       name=self.field,
                       trans=trans,
                       masked_values=mv)
@@ -1051,6 +1477,97 @@ class MartheField():
 
 
 
+def _init_render_worker():
+    """
+    Initialize a frame rendering worker process (non-interactive backend).
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+
+def _render_frame(mf, text, png, dpi, kwargs):
+    """
+    Render a single MartheField frame as png image.
+    Top-level function (picklable) used by MartheFieldSeries.save_animation().
+
+    Parameters:
+    ----------
+    mf (MartheField) : field to plot.
+    text (str) : time reference to write (top left).
+    png (str) : output image file name.
+    dpi (int) : dots per inch (=image/plot resolution).
+    kwargs (dict) : MartheField.plot arguments.
+
+    Returns:
+    --------
+    png (str) : output image file name.
+
+    Examples:
+    --------
+    png = _render_frame(mf, 'istep : 0', '0.png', 200, {'layer': 0})
+    """
+    import matplotlib.pyplot as plt
+    # -- Plot MartheField
+    ax = mf.plot(**kwargs)
+    # -- Add time reference (top left)
+    plt.text(0.01, 0.94, text,
+             fontsize = 7.5, transform=ax.transAxes)
+    # -- Save plot as image
+    fig = ax.get_figure()
+    fig.savefig(png, dpi=dpi)
+    plt.close(fig)
+    return png
+
+
+
+def _iter_rendered_frames(frames, n_workers=1):
+    """
+    Render frames as png images (in parallel if required)
+    and yield image file names in frames order.
+    Frames are consumed lazily: at most 2 frames by worker
+    are pending at once.
+
+    Parameters:
+    ----------
+    frames (iterable) : _render_frame() arguments of each frame.
+                        Format: (mf, text, png, dpi, kwargs)
+    n_workers (int, optional) : number of rendering processes.
+                                Default is 1 (rendering in current process).
+
+    Returns:
+    --------
+    pngs (generator) : output image file names.
+
+    Examples:
+    --------
+    for png in _iter_rendered_frames(frames, n_workers=4):
+        image = imageio.imread(png)
+    """
+    if n_workers <= 1:
+        for frame in frames:
+            yield _render_frame(*frame)
+        return
+    # -- Render frames in spawned workers
+    #    (forking a process with running threads, e.g. numba pool, can deadlock)
+    import multiprocessing
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=n_workers,
+                             mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_init_render_worker) as executor:
+        pending = deque()
+        for frame in frames:
+            pending.append(executor.submit(_render_frame, *frame))
+            # -- Keep a bounded number of frames in flight (time step order)
+            if len(pending) >= 2 * n_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+
+
 class MartheFieldSeries():
     """
     Wrapper Marthe --> python
@@ -1083,6 +1600,10 @@ class MartheFieldSeries():
         self.indexer = marthe_utils.get_chasim_indexer(self.chasim)
         # -- Get available simulated field names
         self.fields = self.indexer.field.unique()
+        # -- Cache indexer subsets by field name (no repeated queries)
+        self._field_groups = {f: sub for f, sub in self.indexer.groupby('field', sort=False)}
+        # -- Cache model dates (fast istep -> date mapping)
+        self._mldates = list(self.mm.mldates)
         # -- Prepare dictionary of sim data
         self.data = dict.fromkeys(self.fields)
 
@@ -1162,7 +1683,8 @@ class MartheFieldSeries():
         assert exist, err_msg
 
         # -- Manage isteps input
-        available_isteps = self.indexer.loc[self.indexer.field == field, 'istep'].unique()
+        sub = self._field_groups[field]
+        available_isteps = sub['istep'].unique()
         if istep is None:
             isteps = available_isteps
         else:
@@ -1172,32 +1694,36 @@ class MartheFieldSeries():
         digits = len(str(np.max(isteps)))
 
         # -- Subset indexer by required field and isetps
-        df = self.indexer.query(f"field == '{field}' & istep in @isteps")
+        df = sub[sub['istep'].isin(isteps)]
 
         # -- Get all required MartheGrid instances
         print(f'Extract `{field}` MartheGrid instances ...')
-        df['mg'] = marthe_utils.read_grid_file(self.chasim, start=df.start, end=df.end)
+        mgs = marthe_utils.read_grid_file(self.chasim, start=df.start, end=df.end)
+
+        # -- Group MartheGrid instances by istep (keeping file order)
+        by_istep = {}
+        for i, mg in zip(df['istep'].tolist(), mgs):
+            by_istep.setdefault(i, []).append(mg)
 
         # -- Iterate over isteps to (re)construct MartheField instances
         print(f'Convert `{field}` to MartheField instances ...')
         mf_dic = {}
         progress = 1
-        for i, idf in df.groupby('istep'):
+        for i in sorted(by_istep):
             # Inform user about the time processing
             marthe_utils.progress_bar(progress/len(isteps))
-            # Get index of start/end section in chasim file
-            start, end = idf['start'].min(), idf['end'].max()
-            # Perform a deepcopy of the .imask field
-            mf = deepcopy(self.mm.imask)
+            # Build field from .imask (shared geometry, no deepcopy)
+            name = '{}_{}'.format(field, str(i).zfill(digits))
+            mf = MartheField._from_shared(self.mm.imask, name)
             # Replace .imask value by field simulated values
-            # (using hstack instead of concatenate to speed up process)
-            mf.data['value'] = np.hstack(
-                                    idf.mg.apply(
-                                        lambda g: g.array.ravel()
-                                        ).to_numpy()
-                                    )
-            # Add field name according to current timestep
-            mf.field = '{}_{}'.format(field, str(i).zfill(digits))
+            # (copying each grid array in its own block of values)
+            values, off = mf.data['value'], 0
+            for mg in by_istep[i]:
+                values[off:off + mg.array.size] = mg.array.ravel()
+                off += mg.array.size
+            err_msg = f"ERROR : `{field}` grids size ({off}) does not match " \
+                      f"model grid size ({len(values)}) at timestep {i}."
+            assert off == len(values), err_msg
             # Add MartheField instance to main field dictionary
             mf_dic[i] = mf
             # Update progress
@@ -1275,27 +1801,31 @@ class MartheFieldSeries():
         # -- Get node numbers of x,y,layer coordinates
         nodes = self.mm.get_node(_x, _y, _layer)
 
-        # -- Get field data on nodes as DataFrame
-        df = pd.DataFrame.from_records(
-              [self.data[field][istep].data[nodes]['value']
-                    for istep in self.data[field].keys()]
-                    )
+        # -- Get field data on nodes (1 row by timestep)
+        isteps = list(self.data[field].keys())
+        _nodes = np.asarray(nodes, dtype=np.intp)
+        values = np.empty((len(isteps), len(_nodes)))
+        for t, istep in enumerate(isteps):
+            values[t] = self.data[field][istep].data['value'][_nodes]
+
+        # -- Replace masked values
+        values[~marthe_utils.fast_mask_out(values, masked_values)] = np.nan
+
+        # -- Convert to DataFrame with MultiIndex
+        df = pd.DataFrame(values,
+                          index = pd.MultiIndex.from_tuples(
+                                [(istep, self._mldates[istep]) for istep in isteps],
+                                names = ['istep', 'date']))
         
         # -- Add column names
         if names is None:
-            ijk = self.mm.query_grid(node=nodes, target=['i','j','layer']).to_numpy() + base
+            # -- Read i,j,layer of nodes directly from .imask (no modelgrid required)
+            ijk = np.column_stack([self.mm.imask.data[c][_nodes]
+                                        for c in ['i','j','layer']]) + base
             df.columns = [f'{ix}i_{iy}j_{ik}k' for ix,iy,ik in ijk]
         else:
             df.columns = marthe_utils.make_iterable(names)
 
-        # -- Convert basic index to MultiIndex
-        df = df.set_index( pd.MultiIndex.from_tuples(
-                                [(istep, self.mm.mldates[istep]) for istep in self.data[field].keys()],
-                                names = ['istep', 'date'])
-                          ).replace(
-                        marthe_utils.make_iterable(masked_values),
-                        np.nan       )
-
         # -- Return Multiindex DataFrame
         if index == 'date':
             return df.droplevel('istep')
@@ -1309,7 +1839,7 @@ class MartheFieldSeries():
 
 
 
-    def save_animation(self, field, filename, dpf = 0.25, dpi=200, **kwargs):
+    def save_animation(self, field, filename, dpf = 0.25, dpi=200, n_workers=1, **kwargs):
         """
         Build a .gif animation from a series of field data.
         /!/ Package `imageio` required /!/
@@ -1327,6 +1857,12 @@ class MartheFieldSeries():
         dpi (int, optional) : dots per inch (=image/plot resolution).
                               Default is 200. 
 
+        n_workers (int, optional) : number of processes rendering frames.
+                                    If > 1, frames are rendered in parallel
+                                    (scripts must be protected by an
+                                    `if __name__ == '__main__':` guard).
+                                    Default is 1.
+
         **kwargs : MartheField.plot arguments.
 
         Returns:
@@ -1344,47 +1880,61 @@ class MartheFieldSeries():
         except ImportError:
             print('ERROR : Could not load `imageio` module. ' \
                   'Try `pip install imageio`.')
+        import matplotlib.pyplot as plt
 
         # -- Check field
         self.check_fieldname(field)
 
+        # -- Get min/max value to fix colorbar (single pass over timesteps)
+        #    (in plotted values precision)
+        if ('vmin' not in kwargs) or ('vmax' not in kwargs):
+            mv = marthe_utils.make_iterable(kwargs.get('masked_values', dmv[::2]))
+            dtype = marthe_utils.get_float_dtype(kwargs.get('precision', 'double'))
+            vmin, vmax = np.inf, -np.inf
+            for mf in self.data[field].values():
+                v = mf.data['value'][marthe_utils.fast_mask_out(mf.data['value'], mv)]
+                v = v.astype(dtype, copy=False)
+                if len(v) > 0:
+                    vmin, vmax = min(vmin, v.min()), max(vmax, v.max())
+            kwargs.setdefault('vmin', vmin)
+            kwargs.setdefault('vmax', vmax)
+
         # ---- Create temporal folder
         tdir = '_temp_'
         if os.path.exists(tdir): shutil.rmtree(tdir)
         os.mkdir(tdir)
-        # -- Get min/max value to fix colorbar (vectorize form for better efficiency)
-        mv = kwargs.get('masked_values', dmv[::2])
-        values = np.array([ mf.data['value'][ ~np.isin(mf.data['value'], mv) ]
-                                                    for mf in self.data[field].values()] )
-        kwargs['vmin'] = kwargs.get('vmin', values.min())
-        kwargs['vmax'] = kwargs.get('vmax', values.max())
-        # -- Save animation
-        print(f'Building animation of simulated `{field}`:')
-        with imageio.get_writer(filename, mode='I', duration = dpf) as writer:
-            # -- iterate over tiem step
-            for i, istep in enumerate(self.data[field].keys()):
-                # -- Plot MartheField
-                ax = self.data[field][istep].plot(**kwargs)
-                # -- Add time reference (top left)
-                ilay = kwargs.get('layer', 0)
+
+        # -- Generate frames arguments (field, time reference, image name)
+        ilay = kwargs.get('layer', 0)
+        digits = len(str(len(self.data[field])))
+        def iter_frames():
+            for istep, mf in self.data[field].items():
                 text =  f'layer : {ilay}\n'     \
                         f'istep : {istep}\n'    \
-                        f'date : {self.mm.mldates[istep]}'
-                plt.text(0.01, 0.94, text,
-                         fontsize = 7.5, transform=ax.transAxes)
-                # -- Save plot as image
-                digits = len(str(len(self.data[field])))
+                        f'date : {self._mldates[istep]}'
                 png = os.path.join(tdir, '{}.png'.format(str(istep).zfill(digits)))
-                ax.get_figure().savefig(png, dpi=dpi)
-                # -- Read image
-                image = imageio.imread(png)
-                writer.append_data(image)
-                # -- Plot progress bar
-                marthe_utils.progress_bar((i+1)/len(self.data[field]))
-        # ---- Delete temporal folder
-        shutil.rmtree(tdir)
-        # -- Close all plots
-        plt.close('all')
+                if n_workers > 1:
+                    # -- Send only plotted data to workers (no parent model)
+                    mf = mf._detach(ilay, kwargs.get('inest', None))
+                yield (mf, text, png, dpi, kwargs)
+
+        # -- Save animation
+        print(f'Building animation of simulated `{field}`:')
+        try:
+            with imageio.get_writer(filename, mode='I', duration = dpf) as writer:
+                # -- iterate over rendered time steps
+                pngs = _iter_rendered_frames(iter_frames(), n_workers)
+                for i, png in enumerate(pngs):
+                    # -- Read image
+                    image = imageio.imread(png)
+                    writer.append_data(image)
+                    # -- Plot progress bar
+                    marthe_utils.progress_bar((i+1)/len(self.data[field]))
+        finally:
+            # ---- Delete temporal folder
+            shutil.rmtree(tdir, ignore_errors=True)
+            # -- Close all plots
+            plt.close('all')
         # -- Success message
         print(f'\nAnimation written in {filename}.')
 
@@ -1450,25 +2000,27 @@ class MartheFieldSeries():
         # ---- Prepare masked_value deletion
         mv = [] if masked_values is None else masked_values
 
-        # ---- Fetch data for all isteps
-        dfs = []
-        for istep, mf in self.data[field].items():
-            data = mf.get_data(layer=layer, inest=inest)
-            df = pd.DataFrame.from_records(data).assign(parts=parts)
-            # -- Manage masked vales
-            df  = df[~df['value'].isin(mv)]
-            # -- Change column name according to istep
-            # am 2023-11-inplace not authorized anymore in pandas
-            # df.rename(columns={'value': mf.field}, inplace=True)
-            df = df.rename(columns={'value': mf.field})
-            dfs.append(df)
-
-        # -- Concatenate drop duplicated layer,inest,i,j,x,y columns
-        _df = pd.concat(dfs, axis=1)
-        df = _df.loc[:,~_df.columns.duplicated()]
+        # ---- Fetch layer,inest,i,j,x,y columns once (shared by all isteps)
+        data = mf0.get_data(layer=layer, inest=inest)
+
+        # ---- Fetch values for all isteps (1 column by istep)
+        mfs = list(self.data[field].values())
+        values = np.empty((len(data), len(mfs)))
+        for k, mf in enumerate(mfs):
+            values[:,k] = mf.get_data(layer=layer, inest=inest)['value']
+
+        # -- Manage masked values (keep cells non-masked on at least one istep)
+        masked = ~marthe_utils.fast_mask_out(values, mv)
+        keep = np.flatnonzero(~masked.all(axis=1))
+        values[masked] = np.nan
+
+        # ---- Build DataFrame with value columns named according to istep
+        df = pd.DataFrame({n: data[n][keep] for n in data.dtype.names if n != 'value'})
+        for k, mf in enumerate(mfs):
+            df[mf.field] = values[keep, k]
 
         # ---- Fetch subset parts (goemetries)
-        parts = df.pop('parts')
+        parts = [parts[k] for k in keep]
 
         # ---- Log transform if required
         if log:
@@ -1478,7 +2030,7 @@ class MartheFieldSeries():
             df =  df.loc[:,mask].add_prefix('log_')
 
         # ---- Convert reccaray to shafile
-        shp_utils.recarray2shp(df.to_records(index=False), np.array(parts),
+        shp_utils.recarray2shp(df.to_records(index=False), parts,
                                shpname=filename, epsg=epsg, prj=prj)
 
 
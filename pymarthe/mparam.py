@@ -7,7 +7,6 @@ layered parameterization
 """
 import os 
 import numpy as np
-from matplotlib import pyplot as plt 
 from .utils import marthe_utils, pest_utils, pp_utils, shp_utils
 import pandas as pd 
 import pyemu
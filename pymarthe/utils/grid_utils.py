@@ -6,7 +6,6 @@ Handle single Marthe grid
 import numpy as np
 import pandas as pd
 import re
-from matplotlib.path import Path
 
 from . import shp_utils, marthe_utils
 
@@ -305,7 +304,11 @@ class MartheGrid():
         -----------
         patches = mg.to_patches()
         """
-        patches = [Path(*p) for p in self.to_pyshp()]
+        # ---- Import matplotlib only when plotting is required
+        from matplotlib.path import Path
+
+        rings = shp_utils.get_rings(self.xcc, self.ycc, self.dx, self.dy)
+        patches = [Path(r) for r in rings]
         return patches
 
 
@@ -1038,6 +1038,63 @@ def make_iterable(var):
 
 
 
+def fast_mask_out(values, masked_values):
+    """
+    Boolean mask of values that are NOT in masked values.
+    Few masked values (<= 4) are compared directly (faster than np.isin).
+
+    Parameters:
+    ----------
+    values (array) : values to test.
+    masked_values (float/list) : value(s) to mask out.
+
+    Returns:
+    --------
+    mask (array) : boolean mask with the shape of values.
+                   True -> value is not masked.
+
+    Examples:
+    --------
+    mask = fast_mask_out(mf.data['value'], [-9999., 0., 9999.])
+    
+    """
+    mv = make_iterable(masked_values)
+    if len(mv) > 4:
+        return ~np.isin(values, mv)
+    mask = np.ones(np.shape(values), dtype=bool)
+    for v in mv:
+        mask &= (values != v)
+    return mask
+
+
+
+
+def get_float_dtype(precision):
+    """
+    Floating point dtype from precision name.
+
+    Parameters:
+    ----------
+    precision (str) : floating point precision.
+                      Can be 'single' (float32) or 'double' (float64).
+
+    Returns:
+    --------
+    dtype (numpy.dtype) : floating point data type.
+
+    Examples:
+    --------
+    arr = mf.data['value'].astype(get_float_dtype('single'), copy=False)
+    
+    """
+    dtypes = {'single': np.float32, 'double': np.float64}
+    err_msg = f"ERROR : `precision` must be 'single' or 'double'. Given : `{precision}`."
+    assert precision in dtypes, err_msg
+    return np.dtype(dtypes[precision])
+
+
+
+
 def read_listm_qfile(qfile, istep, fmt):
     """
     """
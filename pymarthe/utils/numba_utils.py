@@ -0,0 +1,57 @@
+"""
+Contains compiled (numba) kernels
+/!/ Required python `numba` package (imported on demand by shp_utils) /!/
+
+"""
+import numpy as np
+from numba import njit, prange
+
+
+
+
+@njit(cache=True)
+def _pnpoly(x, y, px, py):
+    """
+    PNPoly ray casting test of a single point (compiled with numba).
+    Same crossing test as point_in_polygon().
+
+    Parameters
+    ----------
+    x, y (float) : xy-point.
+    px, py (1D-array) : xy-vertices of the polygon (float).
+
+    Returns
+    -------
+    inside (bool) : True -> point within the polygon.
+    """
+    inside = False
+    j = len(px) - 1
+    for i in range(len(px)):
+        if (py[i] > y) != (py[j] > y):
+            cx = px[i] + (px[j] - px[i]) * (y - py[i]) / (py[j] - py[i])
+            if x < cx:
+                inside = not inside
+        j = i
+    return inside
+
+
+
+
+@njit(parallel=True, cache=True)
+def pnpoly_mask(x, y, px, py):
+    """
+    PNPoly ray casting test of a batch of points (compiled with numba).
+
+    Parameters
+    ----------
+    x, y (1D-array) : xy-points (float).
+    px, py (1D-array) : xy-vertices of the polygon (float).
+
+    Returns
+    -------
+    mask (1D-array) : boolean mask (True -> point within the polygon).
+    """
+    mask = np.zeros(len(x), dtype=np.bool_)
+    for k in prange(len(x)):
+        mask[k] = _pnpoly(x[k], y[k], px, py)
+    return mask
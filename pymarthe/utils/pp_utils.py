@@ -7,7 +7,6 @@ Pilot Points tools
 import os, sys
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import platform
 from pymarthe import MartheModel, MartheField
 from pymarthe.utils import marthe_utils, shp_utils
@@ -367,6 +366,9 @@ class PilotPoints():
         plt.show()
 
         """
+        # ---- Import matplotlib only when plotting is required
+        import matplotlib.pyplot as plt
+
         # -- Manage kwargs
         z_kwg, b_kwg, p_kwg  = [d.copy() for d in [ZONE_KWARGS, BUFFER_KWARGS, PP_KWARGS]]
         z_kwg.update(zone_kwargs)
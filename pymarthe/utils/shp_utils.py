@@ -4,7 +4,7 @@ Contains geospatial export utils
 (not much dependencies required)
 
 """
-import sys 
+import os, sys 
 import numpy as np
 import pandas as pd
 import shutil
@@ -13,6 +13,12 @@ import shapefile
 srefhttp = "https://spatialreference.org"
 PYSHP_TYPES = {'Null':0, 'Point':1, 'LineString':3, 'Polygon':5}
 
+# ---- Minimum number of points to use optional point in polygon backends
+#      (numba/shapely), smaller queries use numpy ray casting
+PIP_MIN_POINTS = 50000
+# ---- Optional point in polygon backends (imported on first large query)
+_pip_backends = {}
+
 
 def read_shapefile(shpname):
     """
@@ -83,6 +89,63 @@ def point_in_polygon(x, y, polygon):
     if (x0, y0) != (xt, yt):
         polygon.append((x0, y0))
 
+    # -- Use optional backends on large queries only
+    if np.size(x) >= PIP_MIN_POINTS:
+        # -- Use compiled PNPoly kernel if available
+        pnpoly_mask = _get_pip_backend('numba')
+        if pnpoly_mask is not None:
+            px, py = np.asarray(polygon, dtype=float).T
+            return pnpoly_mask(np.ravel(x).astype(float), np.ravel(y).astype(float),
+                               np.ascontiguousarray(px), np.ascontiguousarray(py))
+        # -- Use GEOS predicates if available (valid polygon only)
+        shapely = _get_pip_backend('shapely')
+        if shapely is not None:
+            geom = shapely.Polygon(polygon)
+            if geom.is_valid:
+                shapely.prepare(geom)
+                xr, yr = np.ravel(x).astype(float), np.ravel(y).astype(float)
+                mask = shapely.contains_xy(geom, xr, yr)
+                # -- Keep ray casting convention for points on polygon boundary
+                onb = np.flatnonzero(shapely.intersects_xy(geom, xr, yr) & ~mask)
+                if len(onb) > 0:
+                    mask[onb] = _ray_casting(xr[onb], yr[onb], polygon)
+                return mask
+
+    # -- Perform ray casting with numpy
+    return _ray_casting(x, y, polygon)
+
+
+
+
+def _get_pip_backend(name):
+    """
+    Import optional point in polygon backend once (None if not available).
+    Can be:
+        - 'numba' : compiled PNPoly kernel (numba_utils.pnpoly_mask)
+        - 'shapely' : shapely (>= 2.0) module
+    """
+    if name not in _pip_backends:
+        try:
+            if name == 'numba':
+                from .numba_utils import pnpoly_mask as backend
+            else:
+                import shapely as backend
+                # -- Vectorized predicates required (shapely >= 2.0)
+                if not hasattr(backend, 'contains_xy'):
+                    backend = None
+        except ImportError:
+            backend = None
+        _pip_backends[name] = backend
+    return _pip_backends[name]
+
+
+
+
+def _ray_casting(x, y, polygon):
+    """
+    Vectorized ray casting algorithm (numpy) on closed polygon.
+    See point_in_polygon().
+    """
     # -- Reshape x,y arrays (1D -> 2D) if required
     xc = x.reshape((-1,1)) if x.ndim == 1 else x
     yc = y.reshape((-1,1)) if y.ndim == 1 else y
@@ -115,6 +178,60 @@ def point_in_polygon(x, y, polygon):
 
 
 
+# ---- Compile point in polygon kernel at import if required (PYMARTHE_WARM_NUMBA=1)
+if os.environ.get('PYMARTHE_WARM_NUMBA', '0') == '1':
+    _pnpoly_mask = _get_pip_backend('numba')
+    if _pnpoly_mask is not None:
+        _pnpoly_mask(np.zeros(1), np.zeros(1),
+                     np.array([0., 1., 1., 0.]), np.array([0., 0., 1., 1.]))
+
+
+
+
+def zorder(x, y, nbits=16):
+    """
+    Get the permutation that sorts points along a Z-order (Morton) curve.
+    Successive points are spatially close, which improves the locality
+    of repeated spatial index queries.
+
+    Parameters
+    ----------
+    x (1D-array): array of x-points
+    y (1D-array) : array of y-points
+    nbits (int, optional) : number of bits used to quantize each coordinate.
+                            Default is 16.
+
+    Returns
+    -------
+    order (1D-array) : indices that sort the points along the Z-order curve.
+
+    Examples:
+    --------
+    order = zorder(x, y)
+    xs, ys = x[order], y[order]
+
+    """
+    # -- Manage empty input
+    if len(x) == 0:
+        return np.array([], dtype=np.intp)
+    # -- Quantize coordinates on a 2^nbits regular grid
+    keys = []
+    for c in map(np.asarray, [x, y]):
+        cmin, span = c.min(), np.ptp(c)
+        q = np.zeros(c.shape) if span == 0 else (c - cmin) / span
+        keys.append((q * (2**nbits - 1)).astype(np.uint64))
+    # -- Interleave bits of quantized x, y
+    code = np.zeros(len(keys[0]), dtype=np.uint64)
+    for b in range(nbits):
+        for k, q in enumerate(keys):
+            bit = (q >> np.uint64(b)) & np.uint64(1)
+            code |= bit << np.uint64(2*b + k)
+    # -- Return sorting permutation
+    return np.argsort(code, kind='stable')
+
+
+
+
 def shp2points(shpname, stack=True):
     """
     Extract xy-coordinates from a point shapefile.
@@ -146,29 +263,52 @@ def shp2points(shpname, stack=True):
 
 
 
-def get_parts(xcc, ycc, dx, dy):
+def get_rings(xcc, ycc, dx, dy):
     """
-    Return list of polygons parts from points
-    considered as the centers of each polygons
+    Return closed rectangular rings of polygons from points
+    considered as the centers of each polygons (vectorized)
 
     Parameters
     ----------
     xcc, ycc (float) : (xy)cellcenter coordinates
     dx, dy (float) : width, height of model cell
 
+    Returns
+    -------
+    rings (3D-array) : vertices of each polygon.
+                       Shape: (ncell, 5, 2).
+
     """
     # ---- Fetch mesh grid 
     xx, yy = np.meshgrid(xcc, ycc)
     dxx, dyy = np.meshgrid(dx, dy)
     # ---- Transform to 1D arrays
     X, Y, DX, DY = list(map(np.ravel, [xx,yy,dxx,dyy]))
+    # ---- Compute cell bounds
+    xl, xu = X - DX/2, X + DX/2
+    yl, yu = Y - DY/2, Y + DY/2
+    # ---- Stack vertices of all polygons at once
+    rings = np.empty((len(X), 5, 2))
+    rings[:,:,0] = np.column_stack([xl, xl, xu, xu, xl])
+    rings[:,:,1] = np.column_stack([yl, yu, yu, yl, yl])
+    # ---- Return stacked rings
+    return rings
+
+
+
+def get_parts(xcc, ycc, dx, dy):
+    """
+    Return list of polygons parts from points
+    considered as the centers of each polygons
+
+    Parameters
+    ----------
+    xcc, ycc (float) : (xy)cellcenter coordinates
+    dx, dy (float) : width, height of model cell
+
+    """
     # ---- Convert to list of points defining a polygon
-    polygons = []
-    for x,y,dx,dy in zip(X,Y,DX,DY):
-        xl, xu = x - dx/2, x + dx/2
-        yl, yu = y - dy/2, y + dy/2
-        polygon = [[[xl,yl], [xl,yu], [xu,yu], [xu,yl], [xl,yl]]]
-        polygons.append(polygon)
+    polygons = [[ring] for ring in get_rings(xcc, ycc, dx, dy).tolist()]
     # ---- Return list of polygons
     return polygons
 
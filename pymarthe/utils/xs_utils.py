@@ -4,12 +4,6 @@ import pandas as pd
 import numpy as np
 from operator import itemgetter
 
-# -- Import visualisation module
-import matplotlib.pyplot as plt
-from matplotlib.collections import PathCollection
-from matplotlib.path import Path
-from matplotlib.transforms import blended_transform_factory
-
 # -- Import pymarthe objects
 from pymarthe.utils import marthe_utils
 from pymarthe.utils.shp_utils import read_shapefile
@@ -409,6 +403,9 @@ class CrossSection():
         ax = xs.plot(lw=1.5, ls=':', color='green')
         plt.show()
         """
+        # ---- Import matplotlib only when plotting is required
+        import matplotlib.pyplot as plt
+
         # -- Prepare basic axe if not provided
         if ax is None:
             fig, ax = plt.subplots(figsize=(9, 8))
@@ -492,6 +489,11 @@ class CrossSection():
         ax = xs.plot_xs(by_layer=True, ec='white', lw=.3)
         plt.show()
         """
+        # ---- Import matplotlib only when plotting is required
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import PathCollection
+        from matplotlib.path import Path
+
         # -- Check number of layer
         if (by_layer) & (self.mm.nlay == 1):
             warnings.warn(
@@ -638,6 +640,10 @@ class CrossSection():
         plt.show()
 
         """
+        # ---- Import matplotlib only when plotting is required
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import PathCollection
+        from matplotlib.path import Path
 
         # -- Manage field input and extract data from it
         if isinstance(field, str):
@@ -802,6 +808,9 @@ class CrossSection():
             color='red'
             )
         """
+        # ---- Import matplotlib only when plotting is required
+        from matplotlib.transforms import blended_transform_factory
+
         # -- Validate input ax
         self.validate_ax(ax)
         # -- Manage text kwargs
@@ -0,0 +1,61 @@
+"""
+Regression tests of field grid geometry (uneven cell sizes)
+through MartheField.to_grids() and MartheField.write_data().
+
+"""
+import os
+import numpy as np
+import pytest
+
+from pymarthe import MartheModel, MartheField
+from pymarthe.utils.grid_utils import MartheGrid
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples')
+
+DX = [10., 20., 10., 30.]
+DY = [20., 10., 5.]
+
+
+@pytest.fixture(scope='module')
+def mm():
+    return MartheModel(os.path.join(EXAMPLES, 'hallue', 'hallue.rma'))
+
+
+def make_grid(dx, dy, xl=0., yl=0.):
+    """
+    Build a single MartheGrid with uneven cell sizes.
+    """
+    dx, dy = np.asarray(dx, dtype=float), np.asarray(dy, dtype=float)
+    xcc = xl + np.cumsum(dx) - dx/2
+    ycc = (yl + np.cumsum(dy[::-1]) - dy[::-1]/2)[::-1]
+    array = np.arange(1., len(dx) * len(dy) + 1).reshape(len(dy), len(dx))
+    return MartheGrid(0, 0, 0, len(dy), len(dx), xl, yl, dx, dy,
+                      xcc, ycc, array, field='geom')
+
+
+def check_geometry(mf, mg):
+    """
+    Assert that field grid keeps the geometry of a given MartheGrid.
+    """
+    out, = mf.to_grids()
+    np.testing.assert_allclose(out.dx, mg.dx)
+    np.testing.assert_allclose(out.dy, mg.dy)
+    np.testing.assert_allclose(out.xcc, mg.xcc)
+    np.testing.assert_allclose(out.ycc, mg.ycc)
+    assert np.isclose(out.xl, mg.xl) and np.isclose(out.yl, mg.yl)
+    np.testing.assert_allclose(out.array, mg.array)
+
+
+def test_uneven_grid_to_grids(mm):
+    mg = make_grid(DX, DY, xl=100., yl=50.)
+    mf = MartheField('geom', [mg], mm, use_imask=False)
+    check_geometry(mf, mg)
+
+
+def test_uneven_grid_write_data(mm, tmp_path):
+    mg = make_grid(DX, DY, xl=100., yl=50.)
+    mf = MartheField('geom', [mg], mm, use_imask=False)
+    # -- Write field and read it back from file
+    f = str(tmp_path / 'uneven.geom')
+    mf.write_data(f)
+    check_geometry(MartheField('geom', f, mm, use_imask=False), mg)
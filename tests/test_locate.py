@@ -0,0 +1,122 @@
+"""
+Regression tests of grid point location (MartheField._locate)
+against the rtree spatial index of the model.
+
+"""
+import os
+import numpy as np
+import pytest
+
+from pymarthe import MartheModel, MartheField
+from pymarthe.utils.grid_utils import MartheGrid
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples')
+MODELS = [os.path.join(EXAMPLES, 'hallue', 'hallue.rma'),
+          os.path.join(EXAMPLES, 'lizonnev2', 'Lizonne.rma')]
+
+
+def get_points(mm, ncells=150, seed=0):
+    """
+    Build test points on cell centers, edges, corners and outside grids.
+    """
+    rng = np.random.default_rng(seed)
+    x, y, layer = [], [], []
+    xmin, ymin, xmax, ymax = np.inf, np.inf, -np.inf, -np.inf
+    for mg in mm.imask.to_grids():
+        xmin, xmax = min(xmin, mg.xl), max(xmax, mg.xl + mg.Lx)
+        ymin, ymax = min(ymin, mg.yl), max(ymax, mg.yl + mg.Ly)
+        i = rng.integers(0, mg.nrow, ncells)
+        j = rng.integers(0, mg.ncol, ncells)
+        xcc, ycc, dx, dy = mg.xcc[j], mg.ycc[i], mg.dx[j], mg.dy[i]
+        # -- Cell center, edges and corners
+        for fx in [-0.5, 0., 0.5]:
+            for fy in [-0.5, 0., 0.5]:
+                x.append(xcc + fx * dx)
+                y.append(ycc + fy * dy)
+                layer.append(np.full(ncells, mg.layer))
+    # -- Points outside model domain
+    out = np.array([[xmin - 10., ymin], [xmax + 10., ymax],
+                    [xmin, ymin - 10.], [xmax, ymax + 10.]])
+    x.append(out[:,0])
+    y.append(out[:,1])
+    layer.append(np.zeros(len(out), dtype=int))
+    return np.concatenate(x), np.concatenate(y), np.concatenate(layer)
+
+
+@pytest.fixture(scope='module', params=MODELS, ids=['hallue', 'lizonnev2'])
+def model(request, tmp_path_factory):
+    mm = MartheModel(request.param)
+    si_name = str(tmp_path_factory.mktemp('si') / 'si')
+    mm.build_spatial_index(name=si_name)
+    return mm
+
+
+def test_locate_matches_spatial_index(model):
+    mm = model
+    x, y, layer = get_points(mm)
+    # -- Hits from grid location (point id, cell id)
+    pts, idx = mm.imask._locate(x, y, layer)
+    located = sorted(zip(pts.tolist(), idx.tolist()))
+    # -- Hits from spatial index (filtered by layer)
+    imask_layer = mm.imask.data['layer']
+    expected = sorted( (p, n) for p in range(len(x))
+                       for n in mm.spatial_index.intersection((x[p], y[p], x[p], y[p]))
+                       if imask_layer[n] == layer[p] )
+    assert located == expected
+
+
+def test_locate_outside_grid(model):
+    mm = model
+    x, y, layer = get_points(mm, ncells=1)
+    pts, idx = mm.imask._locate(x[-4:], y[-4:], layer[-4:])
+    assert len(pts) == len(idx) == 0
+
+
+def test_sample_without_spatial_index(model):
+    mm = model
+    x, y, layer = get_points(mm, ncells=20, seed=1)
+    # -- Sample with spatial index
+    with_si = mm.imask.sample(x, y, layer, as_idx=True)
+    # -- Sample by grid location
+    si, mm.spatial_index = mm.spatial_index, None
+    try:
+        without_si = mm.imask.sample(x, y, layer, as_idx=True)
+    finally:
+        mm.spatial_index = si
+    assert sorted(without_si) == sorted(with_si)
+
+
+def make_grid(layer, inest, xl, yl, dx, dy, ncol, nrow):
+    """
+    Build a MartheGrid with irregular resolution (ones as values).
+    """
+    dx, dy = np.asarray(dx, dtype=float), np.asarray(dy, dtype=float)
+    xcc = xl + np.cumsum(dx) - dx/2
+    ycc = (yl + np.cumsum(dy[::-1]) - dy[::-1]/2)[::-1]
+    return MartheGrid(0, layer, inest, nrow, ncol, xl, yl, dx, dy,
+                      xcc, ycc, np.ones((nrow, ncol)), field='nest')
+
+
+def test_locate_nested_grids():
+    # -- Main grid (irregular) with a finer nested grid on each layer
+    grids = []
+    for l in range(2):
+        grids.append(make_grid(l, 0, 0., 0., [10., 20., 10., 30.], [20., 10., 10.], 4, 3))
+        grids.append(make_grid(l, 1, 10., 10., [5.] * 4, [5.] * 2, 4, 2))
+    mm = MartheModel(MODELS[0])
+    mf = MartheField('nest', grids, mm, use_imask=False)
+    # -- Points on centers, edges, corners (main + nested) and outside grids
+    rng = np.random.default_rng(0)
+    x = np.r_[rng.uniform(-5., 75., 300), [0., 10., 30., 70., 15., 20., 30., -1., 71.]]
+    y = np.r_[rng.uniform(-5., 45., 300), [0., 10., 20., 40., 15., 10., 20., 5., 5.]]
+    layer = np.resize([0, 1], len(x))
+    # -- Expected hits from cell bounds (all grids, including nested ones)
+    expected = []
+    for mg, (s, e) in zip(grids, [mf._get_group_bounds()[(g.layer, g.inest)] for g in grids]):
+        for p in np.flatnonzero(layer == mg.layer):
+            for i in range(mg.nrow):
+                for j in range(mg.ncol):
+                    if (abs(x[p] - mg.xcc[j]) <= mg.dx[j]/2) and (abs(y[p] - mg.ycc[i]) <= mg.dy[i]/2):
+                        expected.append((p, s + i * mg.ncol + j))
+    pts, idx = mf._locate(x, y, layer)
+    assert sorted(zip(pts.tolist(), idx.tolist())) == sorted(expected)